@@ -40,6 +40,8 @@ def setup_cli():
     parser.add_argument("--title", "-t", help="Video title")
     parser.add_argument("--batch", "-b", action="store_true", help="Schedule batch upload")
     parser.add_argument("--max-videos", type=int, default=5, help="Max videos for batch upload")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Upload the batch now in parallel instead of scheduling it")
     parser.add_argument("--host", default="127.0.0.1", help="GUI host")
     parser.add_argument("--port", type=int, default=8080, help="GUI port")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
@@ -106,6 +108,25 @@ async def run_batch_upload(app: UploaderApp, platform: str, max_videos: int):
     else:
         print("ERROR: No tasks were scheduled")
 
+async def run_parallel_upload(app: UploaderApp, platform: str, max_videos: int):
+    """Загружает пакет сразу, параллельно (до max_concurrent_uploads)"""
+    videos = app.file_manager.get_pending_videos()[:max_videos]
+    if not videos:
+        print("ERROR: No pending videos found")
+        return False
+    
+    print(f"Uploading {len(videos)} videos to {platform} in parallel")
+    
+    results = await app.upload_many([(platform, video.path, None) for video in videos])
+    
+    for video, result in zip(videos, results):
+        status = "SUCCESS" if result.success else "ERROR"
+        print(f"{status}: {video.filename}: {result.message}")
+    
+    succeeded = sum(1 for result in results if result.success)
+    print(f"\nUploaded {succeeded}/{len(results)} videos")
+    return succeeded == len(results)
+
 async def run_gui_mode(app: UploaderApp, host: str, port: int, debug: bool):
     """Запускает приложение в GUI режиме"""
     print(f"Starting web interface at http://{host}:{port}")
@@ -164,6 +185,11 @@ async def main():
             )
             return 0 if success else 1
             
+        elif args.batch and args.parallel:
+            # Пакетная загрузка сразу, несколькими браузерами
+            success = await run_parallel_upload(app, args.platform, args.max_videos)
+            return 0 if success else 1
+            
         elif args.batch:
             # Режим пакетной загрузки
             await run_batch_upload(app, args.platform, args.max_videos)
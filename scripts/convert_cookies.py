@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Одноразовая конвертация cookies из pickle (.cookie) в JSON (.json рядом).
+Исходные .cookie не удаляются — их по-прежнему читают старые скрипты.
+
+Использование: python scripts/convert_cookies.py [папка_или_файл ...]
+"""
+import pickle
+import sys
+from pathlib import Path
+
+from tiktok_common import write_cookies_json
+
+DEFAULT_COOKIES_DIR = "./CookiesDir"
+
+
+def convert(cookie_path: Path) -> Path:
+    """Пишет cookie_path.with_suffix('.json') и возвращает его путь"""
+    with open(cookie_path, "rb") as f:
+        cookies = pickle.load(f)
+    return write_cookies_json(cookie_path, cookies)
+
+
+def main(targets):
+    files = []
+    for target in map(Path, targets or [DEFAULT_COOKIES_DIR]):
+        files.extend(sorted(target.glob("*.cookie")) if target.is_dir() else [target])
+
+    if not files:
+        print("❌ Файлы .cookie не найдены")
+        return 1
+
+    failed = 0
+    for cookie_path in files:
+        try:
+            print(f"✅ {cookie_path} -> {convert(cookie_path)}")
+        except Exception as e:
+            failed += 1
+            print(f"❌ {cookie_path}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
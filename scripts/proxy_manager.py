@@ -155,8 +155,11 @@ class ProxyManager:
             
         return options
     
-    def get_enhanced_chrome_options(self):
-        """Возвращает улучшенные Chrome options с прокси"""
+    def get_enhanced_chrome_options(self, customize=None):
+        """
+        Возвращает улучшенные Chrome options с прокси.
+        customize(options) — хук вызывающего для дополнительных настроек.
+        """
         options = Options()
         
         # Основные настройки для обхода детекции
@@ -199,6 +202,9 @@ class ProxyManager:
         # Добавляем прокси если настроен
         if self.is_configured():
             self.add_proxy_to_options(options)
+        
+        if customize:
+            customize(options)
             
         return options
 
@@ -1,8 +1,14 @@
 import os
+import glob
+import itertools
 import time
-import pickle
+import queue
 import random
 import shutil
+import threading
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -11,57 +17,228 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 
+from tiktok_common import CAPTION_MODEL_TEXT_JS, read_cookies
+
 # Настройки
 COOKIES_FILE = "./CookiesDir/tiktok_session-toptrailer82.cookie"
 VIDEO_FOLDER = "./VideosDirPath"
+# Абсолютный путь один раз при импорте (abspath каждый раз зовет getcwd)
+ABS_VIDEO_FOLDER = os.path.abspath(VIDEO_FOLDER)
 UPLOADED_FOLDER = "./uploaded"
+VIDEO_EXTENSIONS = {".mp4", ".mov"}
 TITLES_FILE = "titles.txt"
 UPLOAD_URL = "https://www.tiktok.com/upload"
+# Путь к chromedriver, найденный webdriver_manager при первом запуске
+CHROMEDRIVER_PATH_FILE = ".chromedriver_path"
+# Соединений к chromedriver в пуле urllib3 (по умолчанию одно)
+COMMAND_POOL_SIZE = 10
+# Параллельная загрузка: по браузеру на каждый файл cookies (не больше MAX_WORKERS)
+COOKIES_DIR = "./CookiesDir"
+MAX_WORKERS = 3
 
 os.makedirs(UPLOADED_FOLDER, exist_ok=True)
 
+# Один Chrome на весь процесс (см. get_driver)
+_driver = None
+# Пул (драйвер, файл cookies) для параллельной загрузки
+DRIVER_POOL = queue.Queue()
+# Ручное подтверждение — по одному окну за раз
+_CONFIRM_LOCK = threading.Lock()
+# Загруженные видео; переносятся в UPLOADED_FOLDER одним проходом после пакета
+PENDING_MOVES = []
+
 def random_delay(base=1.0, variance=0.5):
     time.sleep(base + random.uniform(-variance, variance))
 
 def load_cookies(driver, path):
     driver.get("https://www.tiktok.com/")
-    with open(path, "rb") as f:
-        cookies = pickle.load(f)
+    # JSON рядом с .cookie (см. convert_cookies.py), если он не старше pickle
+    cookies = read_cookies(path)
     for cookie in cookies:
         driver.add_cookie(cookie)
     driver.get(UPLOAD_URL)
 
-def get_video_and_title():
-    videos = [f for f in os.listdir(VIDEO_FOLDER) if f.endswith((".mp4", ".mov"))]
+class TitleCursor:
+    """
+    Заголовки из TITLES_FILE, лениво по одной строке. Выданные строки срезаются
+    из файла одним переписыванием в close() — в конце пакета, вместе с переносом
+    видео (flush_moves), а не после каждой загрузки.
+    """
+
+    def __init__(self):
+        self._taken = []  # выданные строки как есть, в байтах
+
+    def __iter__(self):
+        with open(TITLES_FILE, "rb") as f:
+            for line in f:
+                self._taken.append(line)
+                yield line.decode("utf-8").strip()
+
+    def close(self):
+        if not self._taken:
+            return
+        with open(TITLES_FILE, "rb") as f:
+            data = f.read()
+        taken = b"".join(self._taken)
+        if data.startswith(taken):
+            rest = data[len(taken):]
+        else:
+            # Файл переписали во время пакета (например, FileManager) —
+            # убираем выданные заголовки по значению
+            lines = data.splitlines(keepends=True)
+            for title in (line.strip() for line in self._taken):
+                for i, line in enumerate(lines):
+                    if line.strip() == title:
+                        del lines[i]
+                        break
+            rest = b"".join(lines)
+        tmp_path = TITLES_FILE + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(rest)
+        os.replace(tmp_path, TITLES_FILE)
+        self._taken.clear()
+
+def iter_pending(titles):
+    """
+    Пары (видео, заголовок) для пакетной загрузки.
+    Папка читается один раз, заголовки — лениво по одной строке.
+    """
+    with os.scandir(VIDEO_FOLDER) as it:
+        videos = [
+            e.name for e in it
+            if os.path.splitext(e.name)[1].lower() in VIDEO_EXTENSIONS and e.is_file()
+        ]
     if not videos:
         raise Exception("Нет видео для загрузки.")
-    with open(TITLES_FILE, "r", encoding="utf-8") as f:
-        titles = f.readlines()
-    if not titles:
+    titles = iter(titles)
+    first = next(titles, None)
+    if first is None:
         raise Exception("Файл titles.txt пуст.")
-    title = titles[0].strip()
-    with open(TITLES_FILE, "w", encoding="utf-8") as f:
-        f.writelines(titles[1:])
-    return videos[0], title
+
+    # zip берет заголовок только под существующее видео
+    yield from zip(videos, itertools.chain([first], titles))
 
 def move_uploaded(video_filename):
-    shutil.move(
-        os.path.join(VIDEO_FOLDER, video_filename),
-        os.path.join(UPLOADED_FOLDER, video_filename)
-    )
+    src = os.path.join(ABS_VIDEO_FOLDER, video_filename)
+    dst = os.path.join(UPLOADED_FOLDER, video_filename)
+    try:
+        # Одна файловая система — атомарное переименование без копирования
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
 
-def upload_video():
-    video_file, title = get_video_and_title()
-    print(f"⏫ Загружаем: {video_file} | Заголовок: {title}")
+def flush_moves():
+    """Переносит все загруженные за пакет видео одним проходом"""
+    for video_file in PENDING_MOVES:
+        move_uploaded(video_file)
+    if PENDING_MOVES:
+        print(f"📁 Перемещено в папку uploaded: {len(PENDING_MOVES)}")
+    PENDING_MOVES.clear()
 
+def _chromedriver_path(refresh=False):
+    """Путь к chromedriver: из CHROMEDRIVER_PATH_FILE, webdriver_manager — только при промахе"""
+    cache = Path(CHROMEDRIVER_PATH_FILE)
+    exe = None if refresh or not cache.exists() else cache.read_text().strip()
+    if not exe or not Path(exe).exists():
+        try:
+            # DriverCacheManager есть только в webdriver-manager 4.x
+            from webdriver_manager.core.driver_cache import DriverCacheManager
+            manager = ChromeDriverManager(cache_manager=DriverCacheManager(valid_range=365))
+        except ImportError:
+            manager = ChromeDriverManager()
+        exe = manager.install()
+        cache.write_text(exe)
+    return exe
+
+def _widen_command_pool(driver, maxsize=COMMAND_POOL_SIZE):
+    """
+    Расширяет пул соединений к локальному chromedriver. ClientConfig есть только
+    у Remote-драйвера, поэтому меняем параметры PoolManager уже созданной сессии.
+    """
+    pool_manager = getattr(driver.command_executor, "_conn", None)
+    if pool_manager is None:
+        return
+    pool_manager.connection_pool_kw["maxsize"] = maxsize
+    # Текущий пул создан с maxsize=1 — следующий запрос откроет новый
+    pool_manager.clear()
+
+def _new_driver():
     options = Options()
     options.add_argument("--start-maximized")
+    try:
+        driver = webdriver.Chrome(service=Service(_chromedriver_path()), options=options)
+    except SessionNotCreatedException:
+        # Chrome обновился и старый chromedriver ему не подходит
+        driver = webdriver.Chrome(service=Service(_chromedriver_path(refresh=True)), options=options)
+    _widen_command_pool(driver)
+    return driver
+
+def _driver_alive(driver):
+    """session_id остается и после падения Chrome — проверяем сессию запросом"""
+    try:
+        driver.current_window_handle
+        return True
+    except WebDriverException:
+        return False
+
+def get_driver():
+    """Возвращает общий драйвер; новый Chrome — только при первом вызове или потере сессии"""
+    global _driver
+    if _driver is not None and not _driver_alive(_driver):
+        try:
+            _driver.quit()  # гасим оставшийся chromedriver
+        except WebDriverException:
+            pass
+        _driver = None
+    if _driver is None:
+        _driver = _new_driver()
+    return _driver
+
+def fill_driver_pool(cookie_files):
+    """По браузеру со своей сессией на каждый файл cookies"""
+    for path in cookie_files:
+        driver = _new_driver()
+        load_cookies(driver, path)
+        DRIVER_POOL.put((driver, path))
+
+def _pooled_upload(job):
+    video_file, title = job
+    driver, cookies_path = DRIVER_POOL.get()
+    try:
+        _upload_one(driver, video_file, title, cookies_path=cookies_path)
+    finally:
+        DRIVER_POOL.put((driver, cookies_path))
+
+def _caption_accepted(driver, caption_area, title, timeout=1):
+    """Ждёт, пока заголовок появится в модели редактора, а не только в DOM"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: (d.execute_script(CAPTION_MODEL_TEXT_JS, caption_area) or "").strip()
+            == title.strip()
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def _upload_one(driver, video_file, title, cookies_path=COOKIES_FILE):
+    """
+    Загружает одно видео в уже открытом браузере (cookies загружены заранее).
+    Возвращает True, если кнопка «Опубликовать» нажата.
+    """
+    try:
+        return _fill_and_publish(driver, video_file, title)
+    finally:
+        # Свежая сессия для следующей загрузки без перезапуска браузера — при любом
+        # исходе, иначе следующий файл попадет на недозаполненную форму
+        driver.delete_all_cookies()
+        load_cookies(driver, cookies_path)
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+def _fill_and_publish(driver, video_file, title):
+    print(f"⏫ Загружаем: {video_file} | Заголовок: {title}")
 
-    load_cookies(driver, COOKIES_FILE)
     random_delay(5)
 
     try:
@@ -69,11 +246,10 @@ def upload_video():
         upload_input = WebDriverWait(driver, 60).until(
             EC.presence_of_element_located((By.XPATH, '//input[@type="file"]'))
         )
-        upload_input.send_keys(os.path.abspath(os.path.join(VIDEO_FOLDER, video_file)))
+        upload_input.send_keys(os.path.join(ABS_VIDEO_FOLDER, video_file))
         print("📤 Видео выбрано.")
     except Exception as e:
         print(f"[!] Ошибка при выборе видео: {e}")
-        driver.quit()
         return
 
     random_delay(10)
@@ -86,28 +262,68 @@ def upload_video():
         random_delay(1)
         caption_area.send_keys(Keys.CONTROL + "a")
         caption_area.send_keys(Keys.BACKSPACE)
-        caption_area.send_keys(title)
+        # Весь заголовок одной командой вместо нажатия на каждый символ
+        driver.execute_script(
+            "arguments[0].innerText = arguments[1];"
+            "arguments[0].dispatchEvent(new InputEvent('input', {bubbles: true}));",
+            caption_area, title
+        )
+        # Редактор не принял запись в DOM — очищаем и печатаем по-старому
+        if not _caption_accepted(driver, caption_area, title):
+            caption_area.send_keys(Keys.CONTROL + "a")
+            caption_area.send_keys(Keys.BACKSPACE)
+            caption_area.send_keys(title)
         print("📝 Заголовок вставлен.")
     except Exception as e:
         print(f"[!] Ошибка при вставке заголовка: {e}")
-        driver.quit()
         return
 
-    input("🟢 Проверь всё вручную. Нажми Enter — и видео будет опубликовано...")
+    with _CONFIRM_LOCK:
+        input(f"🟢 Проверь всё вручную ({video_file}). Нажми Enter — и видео будет опубликовано...")
 
+    published = False
     try:
         publish_button = WebDriverWait(driver, 30).until(
             EC.element_to_be_clickable((By.XPATH, '//button[contains(@data-e2e, "upload-post")]'))
         )
         publish_button.click()
+        published = True
         print("✅ Видео отправлено.")
     except Exception as e:
         print(f"[✖] Не удалось нажать кнопку 'Опубликовать': {e}")
 
     random_delay(5)
-    driver.quit()
-    move_uploaded(video_file)
-    print("📁 Видео перемещено в папку uploaded.")
+    PENDING_MOVES.append(video_file)
+    return published
+
+def upload_parallel(cookie_files):
+    """Загружает ожидающие видео параллельно, по сессии на файл cookies"""
+    titles = TitleCursor()
+    try:
+        fill_driver_pool(cookie_files)
+        with closing(iter_pending(titles)) as pending:
+            with ThreadPoolExecutor(max_workers=len(cookie_files)) as executor:
+                list(executor.map(_pooled_upload, pending))
+    finally:
+        while not DRIVER_POOL.empty():
+            DRIVER_POOL.get_nowait()[0].quit()
+        flush_moves()
+        titles.close()
 
 if __name__ == "__main__":
-    upload_video()
+    cookie_files = sorted(glob.glob(os.path.join(COOKIES_DIR, "*.cookie")))[:MAX_WORKERS]
+    if len(cookie_files) > 1:
+        upload_parallel(cookie_files)
+    else:
+        driver = get_driver()
+        titles = TitleCursor()
+        try:
+            load_cookies(driver, COOKIES_FILE)
+            # Все ожидающие видео за одну сессию браузера
+            with closing(iter_pending(titles)) as pending:
+                for video_file, title in pending:
+                    _upload_one(driver, video_file, title)
+        finally:
+            driver.quit()
+            flush_moves()
+            titles.close()
@@ -1,21 +1,28 @@
 import os
+import functools
 import requests
-import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options
 
-# Загружаем переменные окружения
-load_dotenv()
+@functools.lru_cache(maxsize=1)
+def _env():
+    """Окружение с переменными из .env; файл разбирается один раз за процесс"""
+    load_dotenv()
+    return dict(os.environ)
 
 def test_proxy_requests():
     """Тестирует прокси через requests"""
     print("🔍 Тестирование прокси через requests...")
     
-    proxy = os.getenv("PROXY")
-    proxy_user = os.getenv("PROXY_USER")
-    proxy_pass = os.getenv("PROXY_PASS")
+    env = _env()
+    proxy = env.get("PROXY")
+    proxy_user = env.get("PROXY_USER")
+    proxy_pass = env.get("PROXY_PASS")
     
     if not all([proxy, proxy_user, proxy_pass]):
         print("❌ Прокси не настроен в .env файле")
@@ -34,13 +41,23 @@ def test_proxy_requests():
             "https://icanhazip.com"
         ]
         
-        for service in services:
+        # Одна сессия с пулом соединений, сервисы опрашиваются параллельно
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=len(services), pool_block=False)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.proxies = proxies
+        
+        def check(service):
             try:
-                response = requests.get(service, proxies=proxies, timeout=10)
-                ip = response.text.strip()
-                print(f"✅ {service}: {ip}")
+                response = session.get(service, timeout=10)
+                return f"✅ {service}: {response.text.strip()}"
             except Exception as e:
-                print(f"❌ {service}: {e}")
+                return f"❌ {service}: {e}"
+        
+        with session, ThreadPoolExecutor(max_workers=len(services)) as executor:
+            for line in executor.map(check, services):
+                print(line)
                 
         return True
     except Exception as e:
@@ -79,11 +96,16 @@ def test_proxy_browser():
         for service in services:
             try:
                 driver.get(service)
-                time.sleep(3)
-                ip = driver.find_element(By.TAG_NAME, "body").text.strip()
+                # Ждём текст ответа, а не фиксированные 3 секунды
+                ip = WebDriverWait(driver, 10).until(
+                    lambda d: d.find_element(By.TAG_NAME, "body").text.strip()
+                )
                 print(f"✅ {service}: {ip}")
             except Exception as e:
                 print(f"❌ {service}: {e}")
+            finally:
+                # Выгружаем страницу, чтобы не прочитать IP прошлого сервиса
+                driver.get("about:blank")
         
         driver.quit()
         return True
@@ -106,11 +128,8 @@ def check_env_file():
         return False
     
     required_vars = ["PROXY", "PROXY_USER", "PROXY_PASS"]
-    missing_vars = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    env = _env()
+    missing_vars = [var for var in required_vars if not env.get(var)]
     
     if missing_vars:
         print(f"❌ Отсутствуют переменные: {', '.join(missing_vars)}")
@@ -0,0 +1,61 @@
+"""
+Общее для TikTokUploader (src/platforms) и скриптов в scripts/:
+чтение cookies (JSON или pickle) и JS-проверка текста в редакторе подписи.
+"""
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+try:
+    import orjson  # быстрый разбор cookies, если установлен
+except ImportError:
+    orjson = None
+
+# Текст из модели редактора: Draft.js рендерит принятый текст в span[data-text],
+# у обычного contenteditable состояние — сам DOM
+CAPTION_MODEL_TEXT_JS = """
+    const el = arguments[0];
+    if (!el.closest('.DraftEditor-root')) return el.textContent;
+    return Array.from(el.querySelectorAll('span[data-text="true"]'), s => s.textContent).join('');
+"""
+
+
+def json_is_current(cookie_path):
+    """Есть ли рядом с cookie_path JSON-копия не старше него (или это сам JSON)"""
+    cookie_path = Path(cookie_path)
+    json_path = cookie_path.with_suffix(".json")
+    if json_path == cookie_path:
+        return True
+    return json_path.exists() and json_path.stat().st_mtime >= cookie_path.stat().st_mtime
+
+
+def read_cookies(cookie_path):
+    """Cookies из актуальной JSON-копии, иначе из самого файла (JSON или pickle)"""
+    cookie_path = Path(cookie_path)
+    if json_is_current(cookie_path):
+        cookie_path = cookie_path.with_suffix(".json")
+
+    data = cookie_path.read_bytes()
+    if data[:1] != b"\x80":  # не pickle (protocol 2+)
+        return orjson.loads(data) if orjson else json.loads(data)
+    return pickle.loads(data)
+
+
+def write_cookies_json(cookie_path, cookies):
+    """
+    Пишет cookies в JSON рядом с cookie_path и возвращает его путь.
+    Временный файл + os.replace: читатель не увидит недописанный .json
+    """
+    json_path = Path(cookie_path).with_suffix(".json")
+    payload = orjson.dumps(cookies) if orjson else json.dumps(cookies, ensure_ascii=False).encode("utf-8")
+    fd, tmp_path = tempfile.mkstemp(dir=json_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return json_path
@@ -18,6 +18,11 @@ class PlatformConfig:
     retry_attempts: int = 3
     upload_delay: int = 5
     rate_limit: int = 10  # uploads per hour
+    keep_alive: bool = True  # не закрывать браузер между загрузками
+    idle_timeout: int = 300  # секунд простоя до закрытия браузера
+    headless: bool = False  # Chrome без окна
+    user_agent: Optional[str] = None
+    block_images: bool = True  # не грузить картинки, шрифты и медиа
 
 @dataclass
 class AppConfig:
@@ -136,6 +141,7 @@ class ConfigManager:
             'PROXY': ['tiktok', 'proxy'],
             'PROXY_USER': ['tiktok', 'proxy_user'],
             'PROXY_PASS': ['tiktok', 'proxy_pass'],
+            'TIKTOK_USER_AGENT': ['tiktok', 'user_agent'],
             
             # Instagram (заготовка)
             'INSTAGRAM_COOKIES_PATH': ['instagram', 'cookies_path'],
@@ -161,6 +167,9 @@ class ConfigManager:
             'GUI_ENABLED': ['gui_enabled'],
             'TIKTOK_ENABLED': ['tiktok', 'enabled'],
             'INSTAGRAM_ENABLED': ['instagram', 'enabled'],
+            'TIKTOK_KEEP_ALIVE': ['tiktok', 'keep_alive'],
+            'TIKTOK_HEADLESS': ['tiktok', 'headless'],
+            'TIKTOK_BLOCK_IMAGES': ['tiktok', 'block_images'],
         }
         
         for env_key, config_path in bool_mappings.items():
@@ -1,5 +1,6 @@
 import os
 import shutil
+import threading
 from pathlib import Path
 from typing import List, Optional, Tuple
 import logging
@@ -41,6 +42,7 @@ class FileManager:
         self.uploaded_dir = Path(uploaded_dir)
         self.titles_file = Path(titles_file)
         self.logger = logging.getLogger(__name__)
+        self._titles_lock = threading.Lock()
         
         # Создаем директории если не существуют
         self.videos_dir.mkdir(parents=True, exist_ok=True)
@@ -95,31 +97,53 @@ class FileManager:
             self.logger.error(f"Failed to read titles file: {e}")
             return None
     
-    def remove_used_title(self):
-        """Удаляет использованный заголовок из файла"""
+    def peek_next_titles(self, count: int) -> List[str]:
+        """Получает до count следующих заголовков за одно чтение файла (не удаляя их)"""
         try:
-            if not self.titles_file.exists():
-                return
-                
-            with open(self.titles_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
+            if count <= 0 or not self.titles_file.exists():
+                return []
             
-            if not lines:
-                return
-            
-            # Удаляем первую непустую строку
-            new_lines = []
-            first_removed = False
-            
-            for line in lines:
-                if not first_removed and line.strip():
-                    first_removed = True
-                    continue
-                new_lines.append(line)
+            titles = []
+            with open(self.titles_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    title = line.strip()
+                    if title:
+                        titles.append(title)
+                        if len(titles) == count:
+                            break
+            return titles
             
-            # Записываем обратно
-            with open(self.titles_file, 'w', encoding='utf-8') as f:
-                f.writelines(new_lines)
+        except Exception as e:
+            self.logger.error(f"Failed to read titles file: {e}")
+            return []
+    
+    def remove_used_title(self, title: Optional[str] = None):
+        """Удаляет использованный заголовок из файла (по умолчанию — первый)"""
+        try:
+            with self._titles_lock:
+                if not self.titles_file.exists():
+                    return
+                    
+                with open(self.titles_file, 'r', encoding='utf-8') as f:
+                    lines = f.readlines()
+                
+                if not lines:
+                    return
+                
+                # Удаляем первую непустую строку (или первую с этим заголовком)
+                new_lines = []
+                first_removed = False
+                
+                for line in lines:
+                    stripped = line.strip()
+                    if not first_removed and stripped and (title is None or stripped == title):
+                        first_removed = True
+                        continue
+                    new_lines.append(line)
+                
+                # Записываем обратно
+                with open(self.titles_file, 'w', encoding='utf-8') as f:
+                    f.writelines(new_lines)
                 
         except Exception as e:
             self.logger.error(f"Failed to update titles file: {e}")
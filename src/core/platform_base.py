@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 from enum import Enum
 from pathlib import Path
@@ -24,10 +24,17 @@ class VideoMetadata:
     allow_comments: bool = True
     allow_duet: bool = True
     allow_stitch: bool = True
+    # Размер из VideoFile, чтобы проверка не делала повторный stat
+    size_bytes: Optional[int] = None
+    # Вычисляются один раз: путь для send_keys и имя файла для логов
+    abs_path: str = field(init=False, repr=False)
+    file_name: str = field(init=False, repr=False)
     
     def __post_init__(self):
         if self.tags is None:
             self.tags = []
+        self.abs_path = str(Path(self.file_path).resolve())
+        self.file_name = Path(self.file_path).name
 
 @dataclass 
 class UploadResult:
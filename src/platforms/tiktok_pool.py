@@ -0,0 +1,90 @@
+import atexit
+import multiprocessing as mp
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import logging
+
+from ..core.logger import LoggerManager
+from ..core.platform_base import VideoMetadata, UploadResult, UploadStatus
+from .tiktok_uploader import TikTokUploader
+
+# Загрузчик текущего процесса-воркера (по одному Chrome на процесс)
+_worker_uploader: Optional[TikTokUploader] = None
+
+
+def _init_worker(slots, logger_name: str):
+    """Инициализация процесса пула: забирает свой слот конфигурации"""
+    global _worker_uploader
+
+    config = slots.get()
+    logger = LoggerManager().get_logger(logger_name)
+    _worker_uploader = TikTokUploader(config, logger)
+    atexit.register(_worker_uploader.cleanup)
+
+
+def _upload_in_worker(metadata: VideoMetadata) -> UploadResult:
+    """Загружает видео драйвером текущего процесса"""
+    try:
+        return _worker_uploader.upload_video(metadata)
+    except Exception as e:
+        return UploadResult(
+            success=False,
+            platform="tiktok",
+            status=UploadStatus.FAILED,
+            message=f"Worker error: {e}",
+        )
+
+
+class TikTokUploaderPool:
+    """Пул процессов, каждый со своим TikTokUploader и своим Chrome"""
+
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger,
+                 max_workers: int = 2, logger_name: str = "tiktok"):
+        self.config = config
+        self.logger = logger
+        self.logger_name = logger_name
+        self.max_workers = max(1, max_workers)
+
+    def _worker_configs(self) -> List[Dict[str, Any]]:
+        """Готовит конфиги воркеров: свой профиль Chrome, cookies и прокси"""
+        cookies_paths = self.config.get("cookies_paths") or [self.config.get("cookies_path")]
+        proxies = self.config.get("proxies") or []
+        base_dir = Path(self.config.get("user_data_root") or tempfile.gettempdir())
+
+        configs = []
+        for i in range(self.max_workers):
+            worker_config = dict(self.config)
+            worker_config["cookies_path"] = cookies_paths[i % len(cookies_paths)]
+            worker_config["user_data_dir"] = str(base_dir / f"tiktok_{i}")
+            if proxies:
+                worker_config["proxy"] = proxies[i % len(proxies)]
+            configs.append(worker_config)
+        return configs
+
+    def upload_many(self, videos: List[VideoMetadata]) -> List[UploadResult]:
+        """Загружает видео параллельно, результаты в порядке входного списка"""
+        if not videos:
+            return []
+
+        # undetected_chromedriver не переживает fork — только spawn
+        ctx = mp.get_context("spawn")
+        workers = min(self.max_workers, len(videos))
+        slots = ctx.Queue()
+        for worker_config in self._worker_configs()[:workers]:
+            slots.put(worker_config)
+
+        self.logger.info("Starting upload pool: %s videos, %s workers", len(videos), workers)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(slots, self.logger_name),
+        ) as executor:
+            results = list(executor.map(_upload_in_worker, videos))
+
+        succeeded = sum(1 for r in results if r.success)
+        self.logger.info("Upload pool finished: %s/%s successful", succeeded, len(results))
+        return results
@@ -1,25 +1,145 @@
 import os
+import sys
 import time
-import pickle
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     WebDriverException,
+    NoSuchElementException,
     StaleElementReferenceException,
     ElementClickInterceptedException,
 )
 
 from ..core.platform_base import Platform, VideoMetadata, UploadResult, UploadStatus
 
+# Корень проекта в sys.path один раз при импорте (для scripts.tiktok_common и scripts.proxy_manager)
+_ROOT = Path(__file__).resolve().parents[2]
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+from scripts.tiktok_common import (
+    CAPTION_MODEL_TEXT_JS,
+    json_is_current,
+    read_cookies,
+    write_cookies_json,
+)
+try:
+    from scripts.proxy_manager import ProxyManager
+    _PROXY_IMPORT_ERROR = None
+except ImportError as e:
+    ProxyManager = None
+    _PROXY_IMPORT_ERROR = e
+
+# Тексты, которыми TikTok подтверждает публикацию (RU/EN)
+_SUCCESS_TEXTS = (
+    "Your video is being processed",
+    "Ваше видео обрабатывается",
+    "Video uploaded",
+    "Видео загружено",
+    "Successfully",
+    "Успешно",
+)
+_SUCCESS_TEXT_XPATH = "//*[{}]".format(
+    " or ".join(f'contains(text(), "{t}")' for t in _SUCCESS_TEXTS)
+)
+_SUCCESS_TEXT_JS = (
+    "return document.evaluate(arguments[0], document, null, "
+    "XPathResult.BOOLEAN_TYPE, null).booleanValue;"
+)
+
+
+# Локаторы разбираются один раз при импорте; CSS там, где хватает атрибутов
+_UPLOAD_INPUT = (By.CSS_SELECTOR, 'input[type="file"]')
+_CAPTION = (By.CSS_SELECTOR, 'div[contenteditable="true"]')
+# Редактор подписи (Draft.js) важнее общего contenteditable
+_CAPTION_LOCATORS = (
+    (By.CSS_SELECTOR, 'div[data-e2e="caption-container"] div[contenteditable="true"]'),
+    (By.CSS_SELECTOR, "div.public-DraftEditor-content"),
+    _CAPTION,
+)
+# Очистка contenteditable: выделить всё, удалить, уведомить реактивный слой
+_CAPTION_CLEAR_JS = """
+    const el = arguments[0];
+    el.focus();
+    const sel = window.getSelection();
+    const range = document.createRange();
+    range.selectNodeContents(el);
+    sel.removeAllRanges();
+    sel.addRange(range);
+    document.execCommand('delete', false, null);
+    el.innerHTML = '';
+    el.textContent = '';
+    el.dispatchEvent(new InputEvent('input', { bubbles: true }));
+"""
+_PUBLISH_BTN = (By.CSS_SELECTOR, 'button[data-e2e="post_video_button"]')
+# Кнопка «Опубликовать» по тексту (RU/EN) — тут без XPath не обойтись
+_PUBLISH_LABEL_RU = (By.XPATH, '//div[@class="TUXButton-label" and text()="Опубликовать"]/parent::button')
+_PUBLISH_LABEL_EN = (By.XPATH, '//div[@class="TUXButton-label" and text()="Publish"]/parent::button')
+_IMMEDIATE_PUBLISH_LOCATORS = (
+    _PUBLISH_LABEL_RU,
+    _PUBLISH_LABEL_EN,
+    (By.XPATH, '//button[contains(text(), "Опубликовать")]'),
+    (By.XPATH, '//button[contains(text(), "Publish")]'),
+)
+_PUBLISH_LOCATORS = (
+    _PUBLISH_LABEL_RU,
+    _PUBLISH_LABEL_EN,
+    _PUBLISH_BTN,
+    (By.XPATH, '//button[contains(text(),"Опубликовать")]'),
+)
+_AUTH_MARK = (By.CSS_SELECTOR, 'span[class*="avatar"], div[data-e2e*="nav-profile"]')
+# Видео обработано: активная кнопка публикации или плашка успеха
+_UPLOAD_DONE_CSS = (
+    ':is(button[data-e2e="post_video_button"]:not([disabled]):not([aria-disabled="true"]),'
+    ' div[class*="upload-success"])'
+)
+# Модалка подтверждения и кнопка внутри нее
+_CONFIRM_MODAL = (
+    By.XPATH,
+    '//*[(@role="dialog" or contains(@class,"Dialog") or contains(@class,"modal"))'
+    ' and not(contains(@style,"display: none"))]',
+)
+# Кнопка внутри модалки: селекторы в порядке приоритета (объединение через |
+# вернуло бы совпадения в порядке документа)
+_CONFIRM_BTN_XPATHS = (
+    './/button[@data-e2e="upload-confirm-btn" and not(@aria-disabled="true")]',
+    './/button[.//div[@class="TUXButton-label" and (normalize-space()="Опубликовать" or normalize-space()="Publish")] and not(@aria-disabled="true")]',
+    './/div[@class="TUXButton-label" and (normalize-space()="Опубликовать" or normalize-space()="Publish")]/parent::button[not(@aria-disabled="true")]',
+    './/button[(normalize-space()="Опубликовать" or normalize-space()="Publish") and not(@aria-disabled="true")]',
+    './/*[self::button or @role="button"][contains(normalize-space(),"Опубликовать") or contains(normalize-space(),"Publish")][not(@aria-disabled="true")]',
+)
+
+
+# Паузы между попытками аутентификации, с; число попыток — retry_attempts
+_AUTH_BACKOFF = (0.5, 1, 2, 4, 8)
+
+_ALLOWED_EXTENSIONS = frozenset({".mp4", ".mov", ".avi", ".webm"})
+_MAX_VIDEO_BYTES = 4096 * 1024 * 1024
+
+
+def _to_cdp_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """Cookie в формате Selenium -> параметр CDP Network.setCookies"""
+    cdp = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "domain": cookie.get("domain") or ".tiktok.com",
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    if cookie.get("expiry") is not None:
+        cdp["expires"] = cookie["expiry"]
+    if cookie.get("sameSite") in ("Strict", "Lax", "None"):
+        cdp["sameSite"] = cookie["sameSite"]
+    return cdp
+
 
 class TikTokUploader(Platform):
     """Загрузчик видео в TikTok"""
@@ -29,66 +149,127 @@ class TikTokUploader(Platform):
         self.driver = None
         self.upload_url = "https://www.tiktok.com/upload"
         self.max_title_length = 2200
+        self._authenticated = False
+        self._cookie_dismissed = False
+        # Аренда драйвера: пока идет загрузка, простой не закрывает браузер
+        self._driver_lease = 0
+        self._lease_lock = threading.Lock()
+        self._idle_timer = None
+        # Общие ожидания сессии (создаются вместе с драйвером)
+        self._fast_wait = None
+        self._auth_wait = None
+        # Свежая страница загрузки после authenticate() — повторно не открываем
+        self._upload_page_ready = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
     # ---------- AUTH ----------
     def authenticate(self) -> bool:
-        """Аутентификация через cookies"""
+        """
+        Аутентификация через cookies (живая сессия переиспользуется).
+        Сбои браузера повторяются с экспоненциальной паузой, битый файл cookies — нет.
+        """
+        # Под арендой: таймер простоя не закроет только что созданный драйвер
+        self._acquire_driver()
         try:
-            cookies_path = self.config.get("cookies_path")
-            if not cookies_path or not Path(cookies_path).exists():
-                self.logger.error(f"Cookies file not found: {cookies_path}")
-                return False
+            return self._authenticate()
+        finally:
+            self._release_driver()
+
+    def _authenticate(self) -> bool:
+        if self._authenticated and self._driver_alive():
+            return True
 
-            self.driver = self._create_driver()
-            if not self.driver:
+        cookies_path = self.config.get("cookies_path")
+        if not cookies_path or not Path(cookies_path).exists():
+            self.logger.error(f"Cookies file not found: {cookies_path}")
+            return False
+
+        try:
+            cookies = self._load_cookies(Path(cookies_path))
+        except Exception as e:
+            self.logger.error(f"Could not read cookies file {cookies_path}: {e}")
+            return False
+
+        delays = _AUTH_BACKOFF[:max(1, self.config.get("retry_attempts", len(_AUTH_BACKOFF)))]
+        for attempt, delay in enumerate(delays, 1):
+            try:
+                self.logger.debug("Authentication attempt %s/%s", attempt, len(delays))
+                self._authenticate_once(cookies)
+                return True
+            except WebDriverException as e:
+                # TimeoutException — тоже WebDriverException
+                self.logger.debug("Authentication attempt %s failed: %s", attempt, e)
+                self.cleanup()
+                if attempt < len(delays):
+                    time.sleep(delay)
+            except Exception as e:
+                self.logger.error(f"Authentication failed: {e}")
+                self.cleanup()
                 return False
 
-            self.driver.get("https://www.tiktok.com/")
-            time.sleep(3)
+        self.logger.error(f"Authentication failed after {len(delays)} attempts")
+        return False
 
-            with open(cookies_path, "rb") as f:
-                cookies = pickle.load(f)
+    def _authenticate_once(self, cookies: List[Dict[str, Any]]):
+        """Одна попытка: новый драйвер, cookies, страница загрузки"""
+        # Мёртвый или неаутентифицированный драйвер не переиспользуем
+        self.cleanup()
 
-            for cookie in cookies:
-                try:
-                    self.driver.add_cookie(cookie)
-                except Exception as e:
-                    self.logger.debug(f"Could not add cookie: {e}")
+        self.driver = self._create_driver()
+        if not self.driver:
+            raise WebDriverException("Could not create WebDriver")
 
-            self.driver.refresh()
-            time.sleep(5)
+        # Опрос каждые 100 мс вместо 500 мс по умолчанию
+        self._fast_wait = WebDriverWait(
+            self.driver, 60, poll_frequency=0.1,
+            ignored_exceptions=(StaleElementReferenceException,),
+        )
+        self._auth_wait = WebDriverWait(self.driver, 10, poll_frequency=0.1)
 
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    lambda d: d.find_elements(By.XPATH, "//span[contains(@class,'avatar')]")
-                    or d.find_elements(By.XPATH, "//div[contains(@data-e2e,'nav-profile')]")
-                )
-                self.logger.info("Successfully authenticated to TikTok")
-                return True
-            except TimeoutException:
-                self.logger.warning("Could not verify TikTok authentication (continuing)")
-                return True
-        except Exception as e:
-            self.logger.error(f"Authentication failed: {e}")
-            return False
+        # CDP-cookies действуют сразу: без refresh открываем страницу загрузки
+        self._set_cookies(cookies)
+        self.driver.get(self.upload_url)
+
+        try:
+            # Поле файла на /upload есть только у вошедшего пользователя
+            self._auth_wait.until(EC.any_of(
+                EC.presence_of_element_located(_AUTH_MARK),
+                EC.presence_of_element_located(_UPLOAD_INPUT),
+            ))
+            self.logger.info("Successfully authenticated to TikTok")
+        except TimeoutException:
+            self.logger.warning("Could not verify TikTok authentication (continuing)")
+        self._authenticated = True
+        self._upload_page_ready = True
 
     # ---------- PUBLIC API ----------
     def upload_video(self, metadata: VideoMetadata) -> UploadResult:
-        """Загружает видео в TikTok"""
+        """Загружает видео в TikTok (браузер остается открытым для следующих)"""
+        self._acquire_driver()
+        try:
+            return self._upload_video(metadata)
+        finally:
+            self._release_driver()
+
+    def _upload_video(self, metadata: VideoMetadata) -> UploadResult:
         result = UploadResult(
             success=False, platform=self.platform_name, status=UploadStatus.PENDING
         )
 
         try:
-            # Драйвер
-            if not self.driver:
-                if not self.authenticate():
-                    result.message = "Authentication failed"
-                    result.status = UploadStatus.FAILED
-                    return result
+            # Драйвер (сессия переиспользуется между загрузками)
+            if not self.authenticate():
+                result.message = "Authentication failed"
+                result.status = UploadStatus.FAILED
+                return result
 
             # Валидации
-            if not self.validate_video(metadata.file_path):
+            if not self.validate_video(metadata.file_path, metadata.size_bytes):
                 result.message = "Video validation failed"
                 result.status = UploadStatus.FAILED
                 return result
@@ -99,55 +280,52 @@ class TikTokUploader(Platform):
                 return result
 
             result.status = UploadStatus.UPLOADING
-            self.logger.info(f"Starting upload: {metadata.file_path.name}")
+            self.logger.info("Starting upload: %s", metadata.file_name)
 
-            # Страница загрузки
-            self.driver.get(self.upload_url)
-            time.sleep(3)
-            self._handle_cookie_banner()
-
-            wait = WebDriverWait(self.driver, 60)
-
-            # input[type=file]
-            upload_input = wait.until(
-                EC.presence_of_element_located((By.XPATH, '//input[@type="file"]'))
+            # Страница загрузки: состояние прошлой загрузки не переносим,
+            # старый документ помечаем, чтобы не принять его за новый.
+            # Сразу после authenticate() страница уже свежая.
+            if not self._upload_page_ready:
+                try:
+                    self.driver.execute_script(
+                        "window.sessionStorage.clear(); window.__tt_old_page = true;"
+                    )
+                except WebDriverException:
+                    pass
+                self.driver.execute_cdp_cmd("Page.navigate", {"url": self.upload_url})
+            self._upload_page_ready = False
+
+            wait = self._fast_wait
+            wait.until(
+                lambda d: d.execute_script(
+                    "return !window.__tt_old_page && document.readyState === 'complete';"
+                )
             )
-            upload_input.send_keys(str(metadata.file_path.absolute()))
+
+            # input[type=file]; cookie-баннер скрыт скриптом на новом документе
+            upload_input = wait.until(EC.presence_of_element_located(_UPLOAD_INPUT))
+            self._install_upload_watcher()
+            upload_input.send_keys(metadata.abs_path)
             self.logger.info("Video file uploaded, waiting for processing...")
 
             # Ожидание обработки
+            first_publish_clicked = False
             try:
-                wait.until(
-                    EC.any_of(
-                        EC.presence_of_element_located(
-                            (By.XPATH, '//span[contains(text(),"Загружено")]')
-                        ),
-                        EC.presence_of_element_located(
-                            (By.XPATH, '//span[contains(text(),"Uploaded")]')
-                        ),
-                        EC.presence_of_element_located(
-                            (By.XPATH, '//div[contains(@class,"upload-success")]')
-                        ),
-                    )
+                self._fluent(120).until(
+                    lambda d: d.execute_script("return !!window.__tt_uploaded;")
                 )
                 self.logger.info("Video processed successfully")
                 
                 # Проверяем, есть ли кнопка "Опубликовать" сразу после загрузки
                 try:
                     immediate_publish = wait.until(
-                        EC.any_of(
-                            EC.element_to_be_clickable((By.XPATH, '//div[@class="TUXButton-label" and text()="Опубликовать"]/parent::button')),
-                            EC.element_to_be_clickable((By.XPATH, '//div[@class="TUXButton-label" and text()="Publish"]/parent::button')),
-                            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Опубликовать")]')),
-                            EC.element_to_be_clickable((By.XPATH, '//button[contains(text(), "Publish")]'))
-                        )
+                        EC.any_of(*map(EC.element_to_be_clickable, _IMMEDIATE_PUBLISH_LOCATORS))
                     )
-                    
-                    time.sleep(0.8)
+
                     immediate_publish.click()
+                    first_publish_clicked = True
                     self.logger.info("Immediate publish button clicked after upload")
-                    time.sleep(2)
-                    
+
                 except TimeoutException:
                     self.logger.debug("No immediate publish button found after upload - proceeding with title input")
                 
@@ -160,7 +338,7 @@ class TikTokUploader(Platform):
             try:
                 self._handle_cookie_banner()
                 self._clear_and_type_caption(metadata.title)
-                self.logger.info(f"Title set: {metadata.title[:50]}...")
+                self.logger.info("Title set: %.50s...", metadata.title)
             except Exception as e:
                 self.logger.warning(f"Could not set title: {e}")
 
@@ -169,42 +347,24 @@ class TikTokUploader(Platform):
 
             # Первая кнопка «Опубликовать»
             try:
-                publish_button = wait.until(
-                    EC.any_of(
-                        EC.element_to_be_clickable(
-                            (
-                                By.XPATH,
-                                '//div[@class="TUXButton-label" and text()="Опубликовать"]/parent::button',
-                            )
-                        ),
-                        EC.element_to_be_clickable(
-                            (
-                                By.XPATH,
-                                '//div[@class="TUXButton-label" and text()="Publish"]/parent::button',
-                            )
-                        ),
-                        EC.element_to_be_clickable(
-                            (By.XPATH, '//button[@data-e2e="post_video_button"]')
-                        ),
-                        EC.element_to_be_clickable(
-                            (By.XPATH, '//button[contains(text(),"Опубликовать")]')
-                        ),
+                # Кнопку уже нажали сразу после загрузки — повторно не ищем
+                if not first_publish_clicked:
+                    publish_button = wait.until(
+                        EC.any_of(*map(EC.element_to_be_clickable, _PUBLISH_LOCATORS))
                     )
-                )
-                time.sleep(0.8)
-                try:
-                    publish_button.click()
-                except (ElementClickInterceptedException, WebDriverException):
-                    self._handle_cookie_banner()
-                    self._click_with_js(publish_button)
+                    try:
+                        publish_button.click()
+                    except (ElementClickInterceptedException, WebDriverException):
+                        self._handle_cookie_banner()
+                        self._click_with_js(publish_button)
 
-                self.logger.info("Publish button clicked")
+                    self.logger.info("Publish button clicked")
 
                 # Подтвердить во втором окне (если появится)
                 try:
                     self._confirm_publish(timeout=25)
                 except Exception as e:
-                    self.logger.debug(f"Confirm modal handling: {e}")
+                    self.logger.debug("Confirm modal handling: %s", e)
 
                 # Проверяем успешность публикации
                 success_confirmed = self._verify_upload_success(timeout=15)
@@ -212,20 +372,20 @@ class TikTokUploader(Platform):
                 if success_confirmed:
                     result.success = True
                     result.status = UploadStatus.COMPLETED
-                    result.message = f"Successfully uploaded: {metadata.file_path.name}"
+                    result.message = f"Successfully uploaded: {metadata.file_name}"
                     
                     # Пытаемся получить URL видео
                     try:
                         current_url = self.driver.current_url
                         if "tiktok.com" in current_url and current_url != self.upload_url:
                             result.url = current_url
-                            self.logger.info(f"Video URL: {current_url}")
+                            self.logger.info("Video URL: %s", current_url)
                     except Exception:
                         pass
                 else:
                     result.success = True  # Считаем успешным, если дошли до публикации
                     result.status = UploadStatus.COMPLETED
-                    result.message = f"Upload likely successful: {metadata.file_path.name} (verification timeout)"
+                    result.message = f"Upload likely successful: {metadata.file_name} (verification timeout)"
                     self.logger.warning("Could not verify upload success, but assuming successful")
 
             except Exception as e:
@@ -234,7 +394,7 @@ class TikTokUploader(Platform):
                 if "processed successfully" in str(result.message) or result.status == UploadStatus.UPLOADING:
                     result.success = True
                     result.status = UploadStatus.COMPLETED
-                    result.message = f"Upload likely successful despite error: {metadata.file_path.name} - {e}"
+                    result.message = f"Upload likely successful despite error: {metadata.file_name} - {e}"
                     self.logger.warning(f"Assuming upload success despite publish error: {e}")
                 else:
                     result.message = f"Failed to publish: {e}"
@@ -252,46 +412,66 @@ class TikTokUploader(Platform):
         """Полная очистка contenteditable + надёжный ввод текста."""
         wait = WebDriverWait(self.driver, timeout)
 
+        # Сначала редактор подписи (Draft.js), общий contenteditable — запасной
         caption = wait.until(
-            EC.presence_of_element_located((By.XPATH, '//div[@contenteditable="true"]'))
+            EC.any_of(*map(EC.presence_of_element_located, _CAPTION_LOCATORS))
         )
 
         # Жёсткая очистка + событие ввода
+        self.driver.execute_script(_CAPTION_CLEAR_JS, caption)
+        try:
+            self._wait_until(lambda d: d.switch_to.active_element == caption, timeout=2)
+        except TimeoutException:
+            pass
+
+        # Ввод текста одним вызовом: textContent + событие ввода
         self.driver.execute_script(
             """
             const el = arguments[0];
             el.focus();
-
-            // select all
-            const sel = window.getSelection();
-            const range = document.createRange();
-            range.selectNodeContents(el);
-            sel.removeAllRanges();
-            sel.addRange(range);
-
-            // delete
-            document.execCommand('delete', false, null);
-            el.innerHTML = '';
-            el.textContent = '';
-
-            // уведомить реактивный слой
-            el.dispatchEvent(new InputEvent('input', { bubbles: true }));
+            el.textContent = arguments[1];
+            el.dispatchEvent(new InputEvent('input', {
+                bubbles: true, data: arguments[1], inputType: 'insertText'
+            }));
         """,
             caption,
+            text,
         )
-        time.sleep(0.2)
 
-        # Доп. страховка клавишами
-        ActionChains(self.driver).move_to_element(caption).click().key_down(
-            Keys.CONTROL
-        ).send_keys("a").key_up(Keys.CONTROL).send_keys(Keys.BACKSPACE).perform()
-        time.sleep(0.2)
+        # Фолбэк, если редактор не принял запись в DOM в свою модель
+        if not self._caption_accepted(caption, text):
+            self.logger.debug("Caption editor ignored the DOM write, typing instead")
+            self.driver.execute_script(_CAPTION_CLEAR_JS, caption)
+            caption.send_keys(text)
 
-        # Ввод текста
-        caption.send_keys(text)
-        self.driver.execute_script(
-            "arguments[0].dispatchEvent(new InputEvent('input', { bubbles: true }));",
-            caption,
+    def _caption_accepted(self, caption, text: str, timeout: float = 1.0) -> bool:
+        """Ждёт, пока текст появится в модели редактора (у Draft.js — в его span[data-text])"""
+        try:
+            self._wait_until(
+                lambda d: (d.execute_script(CAPTION_MODEL_TEXT_JS, caption) or "").strip()
+                == text.strip(),
+                timeout=timeout,
+                poll=0.1,
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def _wait_until(self, condition, timeout: float, poll: float = 0.25):
+        """Ожидание условия с опросом вместо фиксированного time.sleep"""
+        return self._fluent(timeout, poll).until(condition)
+
+    def _fluent(self, timeout: float, poll: float = 0.1) -> WebDriverWait:
+        """WebDriverWait с частым опросом и игнорированием «дёргающихся» элементов"""
+        return WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=poll,
+            ignored_exceptions=(
+                NoSuchElementException,
+                StaleElementReferenceException,
+                ElementClickInterceptedException,
+            ),
         )
 
     def _click_with_js(self, el):
@@ -308,58 +488,36 @@ class TikTokUploader(Platform):
         Ждёт модалку подтверждения и жмёт вторую «Опубликовать», строго внутри модалки.
         Работает и на RU, и на EN. Делает JS‑клик, если обычный перехвачен.
         """
-        wait = WebDriverWait(self.driver, timeout)
         self._handle_cookie_banner()
 
         # 1) Ждём появление именно модального окна
         try:
-            modal = wait.until(
-                EC.visibility_of_element_located((
-                    By.XPATH,
-                    # любой диалог тт + отсекаем скрытые
-                    '//*[(@role="dialog" or contains(@class,"Dialog") or contains(@class,"modal")) and not(contains(@style,"display: none"))]'
-                ))
+            modal = self._fluent(timeout).until(
+                EC.visibility_of_element_located(_CONFIRM_MODAL)
             )
         except TimeoutException:
             return  # модалки нет — подтверждение не нужно
 
         # 2) Ищем кнопку ТОЛЬКО ВНУТРИ модалки
-        inside_selectors = [
-            './/button[@data-e2e="upload-confirm-btn" and not(@aria-disabled="true")]',
-            './/button[.//div[@class="TUXButton-label" and (normalize-space()="Опубликовать" or normalize-space()="Publish")] and not(@aria-disabled="true")]',
-            './/div[@class="TUXButton-label" and (normalize-space()="Опубликовать" or normalize-space()="Publish")]/parent::button[not(@aria-disabled="true")]',
-            './/button[(normalize-space()="Опубликовать" or normalize-space()="Publish") and not(@aria-disabled="true")]',
-            './/*[self::button or @role="button"][contains(normalize-space(),"Опубликовать") or contains(normalize-space(),"Publish")][not(@aria-disabled="true")]'
-        ]
-
-        btn = None
-        for sel in inside_selectors:
-            els = modal.find_elements(By.XPATH, sel)
-            if els:
-                btn = els[0]
-                break
-
-        if not btn:
-            # иногда кнопка сразу disabled – ждём, пока активируется
-            for _ in range(int(timeout * 5)):  # ~5 раз в секунду
-                for sel in inside_selectors:
-                    els = modal.find_elements(By.XPATH, sel)
-                    if els:
-                        btn = els[0]; break
-                if btn: break
-                time.sleep(0.2)
-
-        if not btn:
+        # иногда кнопка сразу disabled – ждём, пока активируется
+        try:
+            btn = self._fluent(timeout).until(lambda _: self._find_confirm_button(modal))
+        except TimeoutException:
             raise TimeoutException("Кнопка подтверждения публикации в модалке не найдена")
 
         # 3) Страховка: дождаться видимости и снять disabled, потом нажать
         try:
             # если есть aria-disabled=true — ждём, пока станет false
-            for _ in range(50):
-                aria = btn.get_attribute("aria-disabled") or btn.get_attribute("disabled")
-                if not aria or aria == "false":
-                    break
-                time.sleep(0.1)
+            try:
+                self._fluent(5).until(
+                    lambda _: (
+                        btn.get_attribute("aria-disabled")
+                        or btn.get_attribute("disabled")
+                        or "false"
+                    ) == "false"
+                )
+            except TimeoutException:
+                pass
 
             # обычный клик, если перекрыт — JS
             btn.click()
@@ -369,68 +527,58 @@ class TikTokUploader(Platform):
                 self.driver.execute_script("arguments[0].click();", btn)
             except Exception:
                 # финальный ретрай: ещё раз найдём внутри модалки и кликнем JS
-                fresh = None
-                for sel in inside_selectors:
-                    els = modal.find_elements(By.XPATH, sel)
-                    if els:
-                        fresh = els[0]; break
+                fresh = self._find_confirm_button(modal)
                 if not fresh:
                     raise
                 self.driver.execute_script("arguments[0].click();", fresh)
 
         self.logger.info("Confirm Publish clicked (modal)")
 
+    def _find_confirm_button(self, modal):
+        """Первая кнопка по самому точному из сработавших селекторов (или None)"""
+        for xpath in _CONFIRM_BTN_XPATHS:
+            found = modal.find_elements(By.XPATH, xpath)
+            if found:
+                return found[0]
+        return None
+
     def _verify_upload_success(self, timeout: int = 15) -> bool:
         """Проверяет успешность загрузки видео"""
+
+        def published(d):
+            # Переход на страницу видео / профиль / ленту
+            url = d.current_url
+            if url != self.upload_url and "tiktok.com" in url:
+                return True
+            if "/following" in url or "/foryou" in url:
+                return True
+            # Сообщения об успехе — одним XPath-запросом на стороне браузера
+            return d.execute_script(_SUCCESS_TEXT_JS, _SUCCESS_TEXT_XPATH)
+
         try:
-            wait = WebDriverWait(self.driver, timeout)
-            
-            # Проверяем различные индикаторы успешной публикации
-            success_indicators = [
-                # Переход на страницу видео
-                lambda d: d.current_url != self.upload_url and "tiktok.com" in d.current_url,
-                
-                # Сообщения об успехе
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Your video is being processed")]'),
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Ваше видео обрабатывается")]'),
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Video uploaded")]'),
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Видео загружено")]'),
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Successfully")]'),
-                lambda d: d.find_elements(By.XPATH, '//*[contains(text(), "Успешно")]'),
-                
-                # Профильная страница или домашняя
-                lambda d: "/following" in d.current_url or "/foryou" in d.current_url,
-            ]
-            
-            # Проверяем каждый индикатор
-            for check_func in success_indicators:
-                try:
-                    if check_func(self.driver):
-                        self.logger.info("Upload success verified")
-                        return True
-                        
-                    # Небольшая пауза между проверками
-                    time.sleep(1)
-                    
-                except Exception:
-                    continue
-            
+            WebDriverWait(self.driver, timeout).until(published)
+            self.logger.info("Upload success verified")
+            return True
+        except TimeoutException:
             self.logger.debug("Could not verify upload success within timeout")
             return False
-            
         except Exception as e:
-            self.logger.debug(f"Error verifying upload success: {e}")
+            self.logger.debug("Error verifying upload success: %s", e)
             return False
 
     # ---------- UTILS ----------
-    def validate_video(self, file_path: Path) -> bool:
-        if not file_path.exists():
-            return False
-        size_mb = file_path.stat().st_size / (1024 * 1024)
-        if size_mb > 4096:
-            self.logger.error(f"Video too large: {size_mb:.1f}MB")
+    def validate_video(self, file_path: Path, size_bytes: Optional[int] = None) -> bool:
+        # Размер уже известен из VideoFile; иначе один stat вместо exists() + stat()
+        if size_bytes is None:
+            try:
+                size_bytes = os.stat(file_path).st_size
+            except FileNotFoundError:
+                return False
+        if size_bytes > _MAX_VIDEO_BYTES:
+            if self.logger.isEnabledFor(logging.ERROR):
+                self.logger.error(f"Video too large: {size_bytes / (1024 * 1024):.1f}MB")
             return False
-        if file_path.suffix.lower() not in {".mp4", ".mov", ".avi", ".webm"}:
+        if file_path.suffix.lower() not in _ALLOWED_EXTENSIONS:
             self.logger.error(f"Unsupported format: {file_path.suffix}")
             return False
         return True
@@ -445,7 +593,46 @@ class TikTokUploader(Platform):
             "max_uploads_per_day": 100,
         }
 
+    def close(self):
+        """Явно завершает сессию браузера"""
+        self.cleanup()
+
+    def _acquire_driver(self):
+        with self._lease_lock:
+            self._driver_lease += 1
+            self._cancel_idle_timer()
+
+    def _release_driver(self):
+        """Освобождает драйвер; после idle_timeout без загрузок браузер закрывается"""
+        with self._lease_lock:
+            self._driver_lease -= 1
+            idle_timeout = self.config.get("idle_timeout", 300)
+            if self._driver_lease == 0 and self.driver and idle_timeout:
+                self._idle_timer = threading.Timer(idle_timeout, self._close_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def _close_if_idle(self):
+        with self._lease_lock:
+            # Устаревший таймер (успел сработать до отмены или взведён для прежнего
+            # драйвера) ничего не закрывает — действует только последний взведённый
+            if self._driver_lease == 0 and self._idle_timer is threading.current_thread():
+                self.logger.debug("Closing idle WebDriver")
+                self.cleanup()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
     def cleanup(self):
+        # Счетчик аренды не трогаем: authenticate() зовет cleanup() посреди загрузки
+        self._cancel_idle_timer()
+        self._authenticated = False
+        self._fast_wait = None
+        self._auth_wait = None
+        self._upload_page_ready = False
+        self._cookie_dismissed = False
         if self.driver:
             try:
                 self.driver.quit()
@@ -455,49 +642,76 @@ class TikTokUploader(Platform):
             finally:
                 self.driver = None
 
-    def _create_driver(self):
+    def _set_cookies(self, cookies: List[Dict[str, Any]]):
+        """
+        Ставит все cookies одним CDP-вызовом (открытая страница не нужна);
+        по одной — только как запасной вариант.
+        """
         try:
-            import sys
-            root_path = Path(__file__).parent.parent.parent
-            sys.path.insert(0, str(root_path))
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd(
+                "Network.setCookies", {"cookies": [_to_cdp_cookie(c) for c in cookies]}
+            )
+            return
+        except Exception as e:
+            self.logger.debug("Bulk cookie set failed, falling back to add_cookie: %s", e)
+
+        # add_cookie работает только на странице нужного домена
+        self.driver.get("https://www.tiktok.com/")
+
+        for cookie in cookies:
             try:
-                from scripts.proxy_manager import ProxyManager
-            except ImportError as e:
-                self.logger.warning(
-                    f"Could not import ProxyManager: {e}. Using basic Chrome options."
-                )
-                return self._create_basic_driver()
-            
-            # Создаем прокси менеджер
-            proxy_manager = ProxyManager()
-            options = proxy_manager.get_enhanced_chrome_options()
-            driver = uc.Chrome(version_main=None, options=options)
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                self.logger.debug("Could not add cookie: %s", e)
 
-            driver.execute_cdp_cmd(
-                "Page.addScriptToEvaluateOnNewDocument",
-                {
-                    "source": """
-                        Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                        Object.defineProperty(navigator, 'plugins', {get: () => [1,2,3,4,5]});
-                        Object.defineProperty(navigator, 'languages', {get: () => ['en-US','en']});
-                    """
-                },
+    def _load_cookies(self, cookies_path: Path) -> List[Dict[str, Any]]:
+        """
+        Читает cookies из JSON. Старый pickle-файл один раз конвертируется
+        в JSON рядом с ним (исходник остаётся для старых скриптов).
+        """
+        cookies = read_cookies(cookies_path)
+        if not json_is_current(cookies_path):
+            try:
+                json_path = write_cookies_json(cookies_path, cookies)
+                self.logger.info("Cookies migrated to JSON: %s", json_path)
+            except OSError as e:
+                self.logger.warning(f"Could not save JSON cookies: {e}")
+        return cookies
+
+    def _driver_alive(self) -> bool:
+        """Проверяет, что сессия WebDriver ещё отвечает"""
+        if not self.driver:
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _create_driver(self):
+        if ProxyManager is None:
+            self.logger.warning(
+                f"Could not import ProxyManager: {_PROXY_IMPORT_ERROR}. Using basic Chrome options."
             )
-            return driver
-        except Exception as e:
-            self.logger.error(f"Failed to create WebDriver: {e}")
-            return None
+            return self._create_basic_driver()
 
-    def _create_basic_driver(self):
         try:
-            options = uc.ChromeOptions()
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option("useAutomationExtension", False)
+            # Создаем прокси менеджер (прокси из конфига важнее .env)
+            proxy_manager = ProxyManager()
+            if self.config.get("proxy"):
+                proxy_manager.proxy = self.config["proxy"]
+                proxy_manager.proxy_user = self.config.get("proxy_user") or proxy_manager.proxy_user
+                proxy_manager.proxy_pass = self.config.get("proxy_pass") or proxy_manager.proxy_pass
+            options = proxy_manager.get_enhanced_chrome_options(
+                customize=self._apply_chrome_options
+            )
+            driver = uc.Chrome(
+                version_main=None, options=options, log_level=3
+            )
+            # Только явные ожидания: неявное суммируется с ними на каждом промахе
+            driver.implicitly_wait(0)
 
-            driver = uc.Chrome(version_main=None, options=options)
             driver.execute_cdp_cmd(
                 "Page.addScriptToEvaluateOnNewDocument",
                 {
@@ -508,13 +722,12 @@ class TikTokUploader(Platform):
                     """
                 },
             )
-            self.logger.info("Basic Chrome driver created successfully")
+            self._suppress_cookie_banner(driver)
             return driver
         except Exception as e:
-            self.logger.error(f"Failed to create basic WebDriver: {e}")
+            self.logger.error(f"Failed to create WebDriver: {e}")
             return None
 
-    
     def _create_basic_driver(self):
         """Создает базовый WebDriver без прокси"""
         try:
@@ -524,11 +737,23 @@ class TikTokUploader(Platform):
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
             options.add_argument("--disable-blink-features=AutomationControlled")
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            # --log-level Chrome задает сам uc.Chrome (log_level=3);
+            # путь для лога chromedriver uc не принимает — свой Service он строит сам.
+            # Без enable-logging Chrome не пишет лог в консоль
+            options.add_experimental_option(
+                "excludeSwitches", ["enable-automation", "enable-logging"]
+            )
             options.add_experimental_option('useAutomationExtension', False)
+            options.add_argument("--disable-extensions")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--disable-sync")
+            self._apply_chrome_options(options)
             
             # Создаем драйвер
-            driver = uc.Chrome(version_main=None, options=options)
+            driver = uc.Chrome(
+                version_main=None, options=options, log_level=3
+            )
+            driver.implicitly_wait(0)
             
             # Убираем следы автоматизации
             driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
@@ -538,6 +763,7 @@ class TikTokUploader(Platform):
                     Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});
                 """
             })
+            self._suppress_cookie_banner(driver)
             
             self.logger.info("Basic Chrome driver created successfully")
             return driver
@@ -546,8 +772,94 @@ class TikTokUploader(Platform):
             self.logger.error(f"Failed to create basic WebDriver: {e}")
             return None
     
+    def _apply_profile_options(self, options):
+        """Отдельный профиль Chrome, чтобы параллельные драйверы не делили его"""
+        user_data_dir = self.config.get("user_data_dir")
+        if user_data_dir:
+            Path(user_data_dir).mkdir(parents=True, exist_ok=True)
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+
+    def _apply_chrome_options(self, options):
+        """Общие для обоих драйверов настройки профиля, трафика и headless"""
+        self._apply_profile_options(options)
+        self._apply_lightweight_options(options)
+        self._apply_headless_options(options)
+
+    def _apply_lightweight_options(self, options):
+        """Не грузим картинки, шрифты и медиа — для загрузки они не нужны"""
+        # Единственное место для флага: и для базового, и для прокси-драйвера
+        options.add_argument("--disable-background-networking")
+        if not self.config.get("block_images", True):
+            return
+        # Картинки отключаем флагом — он работает с любыми опциями
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        # prefs понимает только uc.ChromeOptions (пишет их в профиль); обычные
+        # Options из ProxyManager отдали бы их chromedriver, и тот не запустится
+        if isinstance(options, uc.ChromeOptions):
+            options.add_experimental_option("prefs", {
+                "profile.managed_default_content_settings.fonts": 2,
+                "profile.managed_default_content_settings.media_stream": 2,
+                # CSS оставляем — на нём держатся селекторы
+                "profile.managed_default_content_settings.stylesheets": 1,
+                "profile.default_content_setting_values.notifications": 2,
+            })
+
+    def _apply_headless_options(self, options):
+        """Безоконный режим для пакетных загрузок (меньше RAM на каждый Chrome)"""
+        if not self.config.get("headless"):
+            return
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--window-size=1920,1080")
+        # В headless UA содержит «HeadlessChrome» — подменяем, если задан
+        user_agent = self.config.get("user_agent")
+        if user_agent:
+            options.add_argument(f"--user-agent={user_agent}")
+
+    def _install_upload_watcher(self):
+        """
+        Вешает MutationObserver, который выставляет window.__tt_uploaded,
+        как только кнопка публикации стала активной (видео обработано).
+        """
+        self.driver.execute_script(
+            """
+            if (window.__tt_watch) return;
+            window.__tt_watch = true;
+            window.__tt_uploaded = false;
+            const ready = () => !!document.querySelector(arguments[0]);
+            const obs = new MutationObserver(() => {
+                if (ready()) { window.__tt_uploaded = true; obs.disconnect(); }
+            });
+            obs.observe(document.body, { subtree: true, attributes: true, childList: true });
+        """,
+            _UPLOAD_DONE_CSS,
+        )
+
+    def _suppress_cookie_banner(self, driver):
+        """Прячет cookie-баннер CSS-правилом ещё до отрисовки каждой страницы"""
+        driver.execute_cdp_cmd(
+            "Page.addScriptToEvaluateOnNewDocument",
+            {
+                "source": """
+                    (function () {
+                        const css = 'tiktok-cookie-banner, .tiktok-cookie-banner, .paas_tiktok'
+                            + ' { display: none !important; }';
+                        const add = () => {
+                            const style = document.createElement('style');
+                            style.textContent = css;
+                            (document.head || document.documentElement).appendChild(style);
+                        };
+                        if (document.documentElement) add();
+                        else document.addEventListener('DOMContentLoaded', add);
+                    })();
+                """
+            },
+        )
+
     def _handle_cookie_banner(self):
-        """Убирает cookie баннер (часто мешает кликам)."""
+        """Убирает cookie баннер (часто мешает кликам). Один раз за сессию."""
+        if self._cookie_dismissed:
+            return
         try:
             js_script = """
             const banners = document.querySelectorAll('tiktok-cookie-banner, .tiktok-cookie-banner, .paas_tiktok');
@@ -568,31 +880,30 @@ class TikTokUploader(Platform):
             """
             handled = self.driver.execute_script(js_script)
             if handled:
+                # Закрытый баннер в этой сессии больше не появляется
+                self._cookie_dismissed = True
                 time.sleep(0.5)
         except Exception as e:
-            self.logger.debug(f"Cookie banner handling failed: {e}")
+            self.logger.debug("Cookie banner handling failed: %s", e)
 
     def _configure_privacy_settings(self, metadata: VideoMetadata):
+        """Приводит переключатели комментариев/дуэтов/стежков к нужному состоянию одним JS-вызовом"""
         try:
-            if not metadata.allow_comments:
-                comment_toggle = self.driver.find_elements(
-                    By.XPATH, '//div[contains(@data-e2e,"allow-comment")]//input'
-                )
-                if comment_toggle and comment_toggle[0].is_selected():
-                    comment_toggle[0].click()
-
-            if not metadata.allow_duet:
-                duet_toggle = self.driver.find_elements(
-                    By.XPATH, '//div[contains(@data-e2e,"allow-duet")]//input'
-                )
-                if duet_toggle and duet_toggle[0].is_selected():
-                    duet_toggle[0].click()
-
-            if not metadata.allow_stitch:
-                stitch_toggle = self.driver.find_elements(
-                    By.XPATH, '//div[contains(@data-e2e,"allow-stitch")]//input'
-                )
-                if stitch_toggle and stitch_toggle[0].is_selected():
-                    stitch_toggle[0].click()
+            self.driver.execute_script(
+                """
+                const want = arguments[0];
+                for (const key in want) {
+                    const input = document.querySelector(
+                        '[data-e2e*="allow-' + key + '"] input'
+                    );
+                    if (input && input.checked !== want[key]) input.click();
+                }
+            """,
+                {
+                    "comment": metadata.allow_comments,
+                    "duet": metadata.allow_duet,
+                    "stitch": metadata.allow_stitch,
+                },
+            )
         except Exception as e:
-            self.logger.debug(f"Could not configure privacy settings: {e}")
+            self.logger.debug("Could not configure privacy settings: %s", e)
@@ -1,8 +1,10 @@
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 import signal
 import sys
+import threading
 from datetime import datetime
 
 from .core.config_manager import ConfigManager, AppConfig
@@ -10,7 +12,7 @@ from .core.logger import LoggerManager, setup_exception_logging
 from .core.file_manager import FileManager, VideoFile
 from .core.scheduler import TaskScheduler, TaskPriority
 from .core.scheduled_uploader import ScheduledUploader, ScheduleType, UploadSchedule
-from .core.platform_base import VideoMetadata, UploadResult
+from .core.platform_base import VideoMetadata, UploadResult, UploadStatus
 from .platforms.tiktok_uploader import TikTokUploader
 from .platforms.instagram_uploader import InstagramUploader
 
@@ -31,7 +33,12 @@ class UploaderApp:
             'console_colors': True
         })
         
-        self.logger = self.logger_manager.get_logger('root')
+        # Логгеры берем один раз: экземпляры платформ создаются и в потоках-воркерах
+        self._loggers = {
+            name: self.logger_manager.get_logger(name)
+            for name in ('root', 'tiktok', 'instagram', 'scheduler', 'scheduled_uploader')
+        }
+        self.logger = self._loggers['root']
         
         # Настройка обработки исключений
         setup_exception_logging()
@@ -55,7 +62,7 @@ class UploaderApp:
                     'max_concurrent_uploads': self.config.max_concurrent_uploads,
                     'scheduler_state_file': './scheduler_state.json'
                 },
-                logger=self.logger_manager.get_logger('scheduler')
+                logger=self._loggers['scheduler']
             )
             
             # Инициализируем планировщик расписаний
@@ -67,12 +74,16 @@ class UploaderApp:
                     'used_videos_file': './used_videos.json',
                     'used_titles_file': './used_titles.json'
                 },
-                logger=self.logger_manager.get_logger('scheduled_uploader'),
+                logger=self._loggers['scheduled_uploader'],
                 scheduler=self.scheduler
             )
         
         # Инициализация платформ
         self.platforms = {}
+        # Экземпляры платформ потоков-воркеров планировщика (свой браузер на поток)
+        self._thread_local = threading.local()
+        self._worker_platforms = []
+        self._worker_lock = threading.Lock()
         try:
             self._init_platforms()
         except Exception as e:
@@ -100,27 +111,32 @@ class UploaderApp:
             titles_path = Path(self.config.titles_file)
             if not titles_path.exists():
                 titles_path.touch()
-                self.logger.info(f"Created titles file: {titles_path}")
+                self.logger.info("Created titles file: %s", titles_path)
     
     def _init_platforms(self):
         """Инициализирует платформы для загрузки"""
         self.logger.info("Initializing platforms...")
         
+        # Конфиги сохраняем: по ним создаются экземпляры для параллельных потоков
+        self._platform_configs = {}
+        
         # TikTok
         if self.config.tiktok.enabled:
-            tiktok_config = {
+            self._platform_configs['tiktok'] = {
                 'cookies_path': self.config.tiktok.cookies_path,
                 'proxy': self.config.tiktok.proxy,
                 'proxy_user': self.config.tiktok.proxy_user,
                 'proxy_pass': self.config.tiktok.proxy_pass,
-                'retry_attempts': self.config.tiktok.retry_attempts
+                'retry_attempts': self.config.tiktok.retry_attempts,
+                'keep_alive': self.config.tiktok.keep_alive,
+                'idle_timeout': self.config.tiktok.idle_timeout,
+                'headless': self.config.tiktok.headless,
+                'user_agent': self.config.tiktok.user_agent,
+                'block_images': self.config.tiktok.block_images
             }
             
             try:
-                self.platforms['tiktok'] = TikTokUploader(
-                    tiktok_config,
-                    self.logger_manager.get_logger('tiktok')
-                )
+                self.platforms['tiktok'] = self._create_platform('tiktok')
                 self.logger.info("TikTok uploader initialized successfully")
             except Exception as e:
                 self.logger.error(f"Failed to initialize TikTok uploader: {e}")
@@ -128,7 +144,7 @@ class UploaderApp:
         
         # Instagram
         if self.config.instagram.enabled:
-            instagram_config = {
+            self._platform_configs['instagram'] = {
                 'cookies_path': self.config.instagram.cookies_path,
                 'proxy': self.config.instagram.proxy,
                 'proxy_user': self.config.instagram.proxy_user,
@@ -137,16 +153,37 @@ class UploaderApp:
             }
             
             try:
-                self.platforms['instagram'] = InstagramUploader(
-                    instagram_config,
-                    self.logger_manager.get_logger('instagram')
-                )
+                self.platforms['instagram'] = self._create_platform('instagram')
                 self.logger.info("Instagram uploader initialized (not implemented yet)")
             except Exception as e:
                 self.logger.error(f"Failed to initialize Instagram uploader: {e}")
                 self.logger.debug("Instagram initialization error details:", exc_info=True)
         
-        self.logger.info(f"Platform initialization complete. Available platforms: {list(self.platforms.keys())}")
+        self.logger.info("Platform initialization complete. Available platforms: %s", list(self.platforms.keys()))
+    
+    def _get_worker_platform(self, platform_name: str):
+        """Экземпляр платформы текущего потока (создается при первом обращении)"""
+        instances = getattr(self._thread_local, 'platforms', None)
+        if instances is None:
+            instances = self._thread_local.platforms = {}
+        
+        if platform_name not in instances:
+            instances[platform_name] = self._create_platform(platform_name)
+            with self._worker_lock:
+                self._worker_platforms.append(instances[platform_name])
+        
+        return instances[platform_name]
+    
+    def _create_platform(self, platform_name: str):
+        """Создает новый экземпляр платформы со своим браузером"""
+        platform_classes = {
+            'tiktok': TikTokUploader,
+            'instagram': InstagramUploader
+        }
+        return platform_classes[platform_name](
+            dict(self._platform_configs[platform_name]),
+            self._loggers[platform_name]
+        )
     
     async def start(self):
         """Запускает приложение"""
@@ -172,8 +209,13 @@ class UploaderApp:
             self.scheduled_uploader.start_scheduler()
         
         # Добавляем обработчики сигналов для graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        self._loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._request_stop, signum)
+            except NotImplementedError:
+                # Windows: нет add_signal_handler — передаем остановку в цикл вручную
+                signal.signal(signum, self._signal_handler)
         
         self.logger.info("UploaderApp started successfully")
     
@@ -193,7 +235,9 @@ class UploaderApp:
             self.scheduler.stop()
         
         # Очищаем ресурсы платформ
-        for platform in self.platforms.values():
+        with self._worker_lock:
+            worker_platforms = list(self._worker_platforms)
+        for platform in list(self.platforms.values()) + worker_platforms:
             platform.cleanup()
         
         self.logger.info("UploaderApp stopped")
@@ -205,29 +249,107 @@ class UploaderApp:
             return UploadResult(
                 success=False,
                 platform=platform_name,
+                status=UploadStatus.FAILED,
                 message=f"Platform {platform_name} not configured"
             )
         
         platform = self.platforms[platform_name]
         
         # Подготавливаем метаданные
+        # Из файла заголовков убираем только взятый оттуда заголовок
+        consume_title = not title
         if not title:
             title = self.file_manager.get_next_title() or video_path.stem
         
+        try:
+            return self._upload_with_platform(
+                platform, platform_name, video_path, title, consume_title, **kwargs
+            )
+        finally:
+            if not platform.config.get('keep_alive'):
+                platform.cleanup()
+    
+    async def upload_many(self, jobs: List[Tuple[str, Path, Optional[str]]]) -> List[UploadResult]:
+        """
+        Загружает несколько видео параллельно (до max_concurrent_uploads).
+        Каждый поток работает со своим экземпляром платформы — драйвер не потокобезопасен.
+        Задание без заголовка берет следующий из файла заголовков (убирается
+        после успешной загрузки), а если их не хватило — имя файла.
+        """
+        if not jobs:
+            return []
+        
+        # Заголовки из файла раздаем заранее: потоки не должны брать один и тот же
+        free_titles = iter(self.file_manager.peek_next_titles(
+            sum(1 for _, _, title in jobs if not title)
+        ))
+        prepared = []
+        for platform_name, video_path, title in jobs:
+            if title:
+                prepared.append((platform_name, video_path, title, False))
+            else:
+                title = next(free_titles, None)
+                prepared.append((platform_name, video_path, title or video_path.stem, title is not None))
+        
+        loop = asyncio.get_running_loop()
+        limit = max(1, self.config.max_concurrent_uploads)
+        semaphore = asyncio.Semaphore(limit)
+        instances: Dict[Tuple[int, str], Any] = {}
+        
+        def do_upload(job) -> UploadResult:
+            platform_name, video_path, title, consume_title = job
+            if platform_name not in self.platforms:
+                return UploadResult(
+                    success=False,
+                    platform=platform_name,
+                    status=UploadStatus.FAILED,
+                    message=f"Platform {platform_name} not configured"
+                )
+            # Один экземпляр на поток: браузер переиспользуется между заданиями потока
+            key = (threading.get_ident(), platform_name)
+            if key not in instances:
+                instances[key] = self._create_platform(platform_name)
+            return self._upload_with_platform(
+                instances[key], platform_name, video_path, title, consume_title
+            )
+        
+        async def run(job) -> UploadResult:
+            async with semaphore:
+                return await loop.run_in_executor(pool, do_upload, job)
+        
+        self.logger.info("Starting parallel upload: %s videos, %s workers", len(jobs), limit)
+        
+        with ThreadPoolExecutor(max_workers=limit) as pool:
+            try:
+                results = await asyncio.gather(*(run(job) for job in prepared))
+            finally:
+                for platform in instances.values():
+                    await loop.run_in_executor(pool, platform.cleanup)
+        
+        return list(results)
+    
+    def _upload_with_platform(self, platform, platform_name: str, video_path: Path,
+                              title: str, consume_title: bool, **kwargs) -> UploadResult:
+        """Аутентификация, загрузка и перенос файла для готового экземпляра платформы"""
         metadata = VideoMetadata(
             file_path=video_path,
             title=title,
             **kwargs
         )
         
-        self.logger.info(f"Starting immediate upload: {video_path.name} to {platform_name}")
+        self.logger.info("Starting immediate upload: %s to %s", video_path.name, platform_name)
         
         try:
+            # Один stat на видео: размер уходит в метаданные для проверки платформой
+            video_file = VideoFile.from_path(video_path)
+            metadata.size_bytes = video_file.size
+            
             # Аутентификация если нужна
             if not platform.authenticate():
                 return UploadResult(
                     success=False,
                     platform=platform_name,
+                    status=UploadStatus.FAILED,
                     message="Authentication failed"
                 )
             
@@ -236,14 +358,13 @@ class UploaderApp:
             
             if result.success:
                 # Перемещаем видео в папку загруженных
-                video_file = VideoFile.from_path(video_path)
                 self.file_manager.move_to_uploaded(video_file)
                 
                 # Убираем использованный заголовок
-                if not kwargs.get('title'):
-                    self.file_manager.remove_used_title()
+                if consume_title:
+                    self.file_manager.remove_used_title(title)
                 
-                self.logger.info(f"Upload successful: {result.message}")
+                self.logger.info("Upload successful: %s", result.message)
             else:
                 self.logger.error(f"Upload failed: {result.message}")
             
@@ -254,14 +375,14 @@ class UploaderApp:
             return UploadResult(
                 success=False,
                 platform=platform_name,
+                status=UploadStatus.FAILED,
                 message=f"Upload error: {e}"
             )
-        finally:
-            platform.cleanup()
     
     def schedule_upload(self, platform_name: str, video_path: Path,
                        title: str = None, scheduled_time: datetime = None,
-                       priority: TaskPriority = TaskPriority.NORMAL) -> Optional[str]:
+                       priority: TaskPriority = TaskPriority.NORMAL,
+                       consume_title: bool = False) -> Optional[str]:
         """Добавляет загрузку в планировщик"""
         if not self.scheduler:
             self.logger.error("Scheduler not enabled")
@@ -272,17 +393,24 @@ class UploaderApp:
             return None
         
         if not title:
-            title = self.file_manager.get_next_title() or video_path.stem
+            title = self.file_manager.get_next_title()
+            if title:
+                # Заголовок из файла: иначе он достанется и следующей задаче
+                consume_title = True
+            else:
+                title = video_path.stem
         
         task_id = self.scheduler.add_task(
             platform=platform_name,
             video_path=video_path,
             title=title,
             scheduled_time=scheduled_time,
-            priority=priority
+            priority=priority,
+            # Заголовок убирается из файла только после успешной загрузки
+            metadata={'consume_title': True} if consume_title else None
         )
         
-        self.logger.info(f"Task scheduled: {task_id}")
+        self.logger.info("Task scheduled: %s", task_id)
         return task_id
     
     def schedule_batch_upload(self, platform_name: str, max_videos: int = 5) -> List[str]:
@@ -292,15 +420,18 @@ class UploaderApp:
             return []
         
         videos = self.file_manager.get_pending_videos()[:max_videos]
+        titles = self.file_manager.peek_next_titles(len(videos))
         task_ids = []
         
-        for video in videos:
-            title = self.file_manager.get_next_title() or video.filename
-            task_id = self.schedule_upload(platform_name, video.path, title)
+        for i, video in enumerate(videos):
+            has_title = i < len(titles)
+            title = titles[i] if has_title else video.filename
+            task_id = self.schedule_upload(platform_name, video.path, title,
+                                           consume_title=has_title)
             if task_id:
                 task_ids.append(task_id)
         
-        self.logger.info(f"Scheduled {len(task_ids)} videos for batch upload")
+        self.logger.info("Scheduled %s videos for batch upload", len(task_ids))
         return task_ids
     
     # Методы для работы с расписаниями
@@ -370,7 +501,7 @@ class UploaderApp:
     
     def _on_task_start(self, task):
         """Callback при начале выполнения задачи"""
-        self.logger.info(f"Task started: {task.id} - {task.platform} - {task.title[:50]}...")
+        self.logger.info("Task started: %s - %s - %.50s...", task.id, task.platform, task.title)
     
     def _on_task_complete(self, task, success: bool):
         """Callback при завершении задачи"""
@@ -379,11 +510,14 @@ class UploaderApp:
             try:
                 video_file = VideoFile.from_path(task.video_path)
                 self.file_manager.move_to_uploaded(video_file)
-                self.logger.info(f"Video moved to uploaded: {task.video_path.name}")
+                self.logger.info("Video moved to uploaded: %s", task.video_path.name)
             except Exception as e:
                 self.logger.error(f"Failed to move video: {e}")
+            
+            if task.metadata.get('consume_title'):
+                self.file_manager.remove_used_title(task.title)
         
-        self.logger.info(f"Task completed: {task.id} - Success: {success}")
+        self.logger.info("Task completed: %s - Success: %s", task.id, success)
     
     def _on_task_fail(self, task):
         """Callback при неудачном выполнении задачи"""
@@ -396,7 +530,8 @@ class UploaderApp:
                 self.logger.error(f"Platform {task.platform} not configured")
                 return False
             
-            platform = self.platforms[task.platform]
+            # Воркеры планировщика работают параллельно — у каждого свой экземпляр
+            platform = self._get_worker_platform(task.platform)
             
             # Подготавливаем метаданные
             metadata = VideoMetadata(
@@ -406,7 +541,7 @@ class UploaderApp:
                 tags=task.tags
             )
             
-            self.logger.info(f"Executing scheduled task: {task.video_path.name} to {task.platform}")
+            self.logger.info("Executing scheduled task: %s to %s", task.video_path.name, task.platform)
             
             # Аутентификация если нужна
             if not platform.authenticate():
@@ -417,7 +552,7 @@ class UploaderApp:
             result = platform.upload_video(metadata)
             
             if result.success:
-                self.logger.info(f"Scheduled upload successful: {result.message}")
+                self.logger.info("Scheduled upload successful: %s", result.message)
                 return True
             else:
                 self.logger.error(f"Scheduled upload failed: {result.message}")
@@ -427,13 +562,18 @@ class UploaderApp:
             self.logger.error(f"Scheduled task execution error: {e}")
             return False
         finally:
-            if task.platform in self.platforms:
-                self.platforms[task.platform].cleanup()
+            platform = getattr(self._thread_local, 'platforms', {}).get(task.platform)
+            if platform and not platform.config.get('keep_alive'):
+                platform.cleanup()
+    
+    def _request_stop(self, signum):
+        """Планирует остановку в цикле событий (вызывается из цикла)"""
+        self.logger.info("Received signal %s, shutting down...", signum)
+        self._loop.create_task(self.stop())
     
     def _signal_handler(self, signum, frame):
-        """Обработчик сигналов для graceful shutdown"""
-        self.logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(self.stop())
+        """Обработчик сигналов для платформ без loop.add_signal_handler"""
+        self._loop.call_soon_threadsafe(self._request_stop, signum)
 
 # Пример использования
 async def main():
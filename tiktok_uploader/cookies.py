@@ -2,7 +2,9 @@ from .Config import Config
 from .basics import eprint
 
 import pickle
+import json
 import os
+import tempfile
 
 
 def load_cookies_from_file(filename: str, cookies_path=None):
@@ -15,7 +17,13 @@ def load_cookies_from_file(filename: str, cookies_path=None):
         print("User not found on system.")
         return []
     
-    cookie_data = pickle.load(open(cookie_path, "rb"))
+    # JSON-копия (пишется рядом при сохранении) свежее или равна pickle
+    json_path = os.path.splitext(cookie_path)[0] + ".json"
+    if os.path.exists(json_path) and os.path.getmtime(json_path) >= os.path.getmtime(cookie_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            cookie_data = json.load(f)
+    else:
+        cookie_data = pickle.load(open(cookie_path, "rb"))
     cookies = []
     for cookie in cookie_data:
         # still necessary?
@@ -35,6 +43,17 @@ def save_cookies_to_file(cookies, filename: str, cookies_path=None):
     with open(cookie_path, "wb") as f:
         pickle.dump(cookies, f)
         f.close()
+    # JSON рядом: быстрее и безопаснее для загрузчика; pickle — для старых скриптов.
+    # Пишем во временный файл и подменяем, чтобы читатель не поймал половину файла
+    json_path = os.path.splitext(cookie_path)[0] + ".json"
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(json_path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cookies, f, ensure_ascii=False)
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def delete_cookies_file(filename: str, cookies_path=None):